@@ -1,468 +1,660 @@
-import pandas as pd
-import numpy as np
-import streamlit as st
-import plotly.express as px
-import os
-from datetime import datetime
-
-st.set_page_config(layout="wide", page_title="Análise de Contas a Pagar")
-
-def formatar_moeda(valor, simbolo_moeda="R$"):
-    """
-    Formata um valor numérico para o formato de moeda brasileiro (R$ X.XXX,XX).
-    Retorna uma string vazia se o valor for NaN ou 'Valor inválido' em caso de erro.
-    """
-    if pd.isna(valor):
-        return ''
-    try:
-        # Garante que o valor é numérico antes de formatar
-        valor = float(valor)
-        return f"{simbolo_moeda} {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-    except (TypeError, ValueError):
-        return "Valor inválido"
-
-def format_date_br(data):
-    """
-    Formata uma data para o padrão brasileiro (DD/MM/AAAA).
-    Retorna uma string vazia se a data for NaN.
-    """
-    if pd.isna(data):
-        return ''
-    return data.strftime('%d/%m/%Y')
-
-def highlight_overdue(row):
-    """
-    Função para destacar linhas de contas vencidas em um DataFrame.
-    Retorna uma lista de strings de estilo CSS.
-    """
-    today = pd.to_datetime('today').normalize()
-    if 'Data Vencimento' in row.index and pd.notna(row['Data Vencimento']):
-        try:
-            # Tenta converter para datetime se ainda não for
-            dt_venc = row['Data Vencimento']
-            if not pd.api.types.is_datetime64_any_dtype(dt_venc):
-                 dt_venc = pd.to_datetime(dt_venc, errors='coerce')
-
-            if pd.notna(dt_venc) and dt_venc < today:
-                return ['background-color: #f8230f'] * len(row) # Vermelho
-        except:
-            pass # Ignora erros de conversão de data, não aplica destaque
-    return [''] * len(row) # Sem destaque
-
-INPUT_CSV_FILE = 'contas_pagar.csv'
-
-@st.cache_data
-def load_data_from_csv():
-    """
-    Carrega e pré-processa os dados do arquivo CSV.
-    Utiliza st.cache_data para otimizar o carregamento.
-    """
-    if not os.path.exists(INPUT_CSV_FILE):
-        st.error(f"Erro: O arquivo '{INPUT_CSV_FILE}' não foi encontrado. Por favor, coloque '{INPUT_CSV_FILE}' na mesma pasta do aplicativo.")
-        st.stop()
-
-    df = pd.read_csv(INPUT_CSV_FILE)
-
-    # Conversão de colunas de data
-    df['data_emissao'] = pd.to_datetime(df['data_emissao'], errors='coerce')
-    df['data_vencimento'] = pd.to_datetime(df['data_vencimento'], errors='coerce')
-    df['data_quitacao'] = pd.to_datetime(df['data_quitacao'], errors='coerce')
-
-    # Conversão de colunas numéricas (lidando com vírgulas como separador decimal)
-    for col in ['valor_documento', 'valor_desconto', 'valor_saldo']:
-        df[col] = df[col].astype(str).str.replace(',', '.')
-        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-
-    # Preenchimento de valores ausentes em colunas de texto
-    df['fornecedor'] = df['fornecedor'].fillna('Fornecedor Não Informado')
-    df['descricao_tipo_documento'] = df['descricao_tipo_documento'].fillna('Não Informado')
-
-    # Criação de colunas auxiliares para análise de período
-    df['numero_documento_base'] = df['numero_documento'].apply(lambda x: x.split('/')[0] if isinstance(x, str) and '/' in x else str(x))
-    df['MES_ANO_VENCIMENTO'] = df['data_vencimento'].dt.to_period('M')
-    df['MES_ANO_QUITACAO'] = df['data_quitacao'].dt.to_period('M')
-    return df
-
-# Carrega os dados
-df = load_data_from_csv()
-
-def get_valor_total_contas_a_pagar(df_filtered):
-    """Calcula o valor total de contas a pagar no DataFrame filtrado."""
-    return df_filtered['valor_documento'].sum()
-
-def get_valor_total_contas_a_pagar_aberto(df_filtered):
-    """Calcula o valor total de contas em aberto no DataFrame filtrado."""
-    df_aberto = df_filtered[df_filtered['status_documento'].str.lower() == 'aberto']
-    return df_aberto['valor_saldo'].sum()
-
-st.title("📊 Análise de Contas a Pagar")
-
-# ---
-st.markdown("---")
-## 🔍 Filtros Globais
-
-
-with st.expander("🔍 Filtros Globais", expanded=True):
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        # Pega só os períodos do ano atual para o filtro de mês
-        ano_atual = datetime.today().year
-        periodos_ano_atual = df['MES_ANO_VENCIMENTO'].dropna().unique()
-        periodos_ano_atual = [p for p in periodos_ano_atual if p.year == ano_atual]
-
-        # Ordena e converte para string
-        all_periods = sorted(list(set(pd.Series(periodos_ano_atual).astype(str))))
-        meses_opcoes_global = ['Todos os Meses'] + all_periods
-        
-        # Define 'Todos os Meses' como padrão (índice 0)
-        mes_selecionado_global = st.selectbox("Selecione o Mês de Análise:", options=meses_opcoes_global, index=0)
-
-    with col2:
-        status_opcoes = ['Todos'] + sorted(df['status_documento'].dropna().unique().tolist())
-        # Define 'Todos' como padrão para status
-        status_selecionados = st.multiselect("Filtrar Status do Documento:", options=status_opcoes, default=['Todos'])
-
-    with col3:
-        tipo_opcoes = ['Todos'] + sorted(df['descricao_tipo_documento'].dropna().unique().tolist())
-        # Define 'Todos' como padrão para tipo de documento
-        tipo_selecionados = st.multiselect("Filtrar Tipo de Documento:", options=tipo_opcoes, default=['Todos'])
-
-# Aplicação dos filtros no DataFrame global
-df_filtrado_global = df.copy()
-
-if mes_selecionado_global != 'Todos os Meses':
-    period_selected = pd.Period(mes_selecionado_global, 'M')
-    # Filtra por mês de vencimento OU mês de quitação, para abranger ambos os cenários
-    df_filtrado_global = df_filtrado_global[
-        (df_filtrado_global['MES_ANO_VENCIMENTO'] == period_selected) |
-        (df_filtrado_global['MES_ANO_QUITACAO'] == period_selected)
-    ]
-
-if 'Todos' not in status_selecionados:
-    df_filtrado_global = df_filtrado_global[df_filtrado_global['status_documento'].isin(status_selecionados)]
-
-if 'Todos' not in tipo_selecionados:
-    df_filtrado_global = df_filtrado_global[df_filtrado_global['descricao_tipo_documento'].isin(tipo_selecionados)]
-
-# ---
-st.markdown("---")
-## Visão Geral do Período Selecionado
-
-st.subheader("Visão Geral do Período Selecionado")
-titulo_visao_geral = "Todos os Meses" if mes_selecionado_global == 'Todos os Meses' else mes_selecionado_global
-
-col1_metric, col2_metric = st.columns(2)
-
-with col1_metric:
-    valor_total_contas = get_valor_total_contas_a_pagar(df_filtrado_global)
-    st.metric(label=f"Valor Total de Contas ({titulo_visao_geral})", value=formatar_moeda(valor_total_contas))
-
-with col2_metric:
-    valor_aberto = get_valor_total_contas_a_pagar_aberto(df_filtrado_global)
-    st.metric(label=f"Valor Total em Aberto ({titulo_visao_geral})", value=formatar_moeda(valor_aberto))
-
-# ---
-st.markdown("---")
-## Contas em Aberto (Respeitando Período e Filtros)
-
-
-st.subheader("Contas em Aberto (Respeitando Período e Filtros)")
-
-df_em_aberto = df_filtrado_global[df_filtrado_global['status_documento'].str.lower() == 'aberto']
-
-if not df_em_aberto.empty:
-    df_display_aberto = df_em_aberto[['fornecedor', 'numero_documento', 'data_vencimento', 'valor_saldo', 'descricao_tipo_documento']].rename(columns={
-        'fornecedor': 'Fornecedor',
-        'numero_documento': 'Número Documento',
-        'data_vencimento': 'Data Vencimento',
-        'valor_saldo': 'Valor a Pagar',
-        'descricao_tipo_documento': 'Tipo Documento'
-    })
-    # Aplica o destaque para vencidos e formatação de moeda/data
-    st.dataframe(df_display_aberto.style.apply(highlight_overdue, axis=1).format({
-        "Valor a Pagar": formatar_moeda,
-        "Data Vencimento": format_date_br
-    }))
-else:
-    st.info("Não há contas em aberto para o período e filtros selecionados.")
-
-# ---
-st.markdown("---")
-## 📅 Contas a Pagar por Período
-
-st.subheader("📅 Contas a Pagar por Período")
-
-ano_atual = datetime.today().year
-
-if mes_selecionado_global == 'Todos os Meses':
-    # Filtra apenas vencimentos do ano atual para o gráfico mensal
-    df_ano_atual = df_filtrado_global[df_filtrado_global['data_vencimento'].dt.year == ano_atual]
-
-    valores_periodo = df_ano_atual.groupby(df_ano_atual['MES_ANO_VENCIMENTO'])['valor_documento'].sum().reset_index()
-    valores_periodo['MES_ANO_VENCIMENTO'] = valores_periodo['MES_ANO_VENCIMENTO'].astype(str)
-    valores_periodo['valor_documento_formatado'] = valores_periodo['valor_documento'].apply(formatar_moeda)
-    title_graph = f"📅 Contas a Pagar por Mês de Vencimento ({ano_atual})"
-    x_axis = 'MES_ANO_VENCIMENTO'
-else:
-    # Filtra por dia se um mês específico for selecionado
-    valores_periodo = df_filtrado_global.groupby(df_filtrado_global['data_vencimento'].dt.date)['valor_documento'].sum().reset_index()
-    valores_periodo['valor_documento_formatado'] = valores_periodo['valor_documento'].apply(formatar_moeda)
-    title_graph = "📅 Contas a Pagar por Dia de Vencimento"
-    x_axis = 'data_vencimento'
-
-if not valores_periodo.empty:
-    fig_venc = px.bar(
-        valores_periodo,
-        x=x_axis,
-        y='valor_documento',
-        title=title_graph,
-        text='valor_documento_formatado', # Usa a coluna formatada para o texto da barra
-        height=600
-    )
-
-    fig_venc.update_traces(
-        texttemplate='%{text}',
-        textposition='outside',
-        textfont=dict(size=14)
-    )
-
-    fig_venc.update_layout(
-        uniformtext_minsize=8,
-        uniformtext_mode='show',
-        yaxis=dict(tickprefix="R$ "), # Prefixo de moeda no eixo Y
-        xaxis_title='Período',
-        yaxis_title='Valor Total (R$)'
-    )
-
-    st.plotly_chart(fig_venc, use_container_width=True)
-else:
-    st.info("Não há dados para exibir no gráfico de contas a pagar para os filtros selecionados.")
-
-# ---
-st.markdown("---")
-## 📌 Contas Vencidas em Aberto (Atrasadas)
-
-st.subheader("📌 Contas Vencidas em Aberto (Atrasadas)")
-
-# Filtra documentos em aberto e que a data de vencimento é anterior a hoje
-df_vencidas_em_aberto = df_filtrado_global[
-    (df_filtrado_global['status_documento'].str.lower() == 'aberto') &
-    (df_filtrado_global['data_vencimento'] < pd.to_datetime('today').normalize())
-]
-
-valor_total_vencido = df_vencidas_em_aberto['valor_saldo'].sum()
-quantidade_titulos_vencidos = df_vencidas_em_aberto.shape[0]
-
-# Calcula o valor total em aberto para o percentual
-valor_total_em_aberto = df_filtrado_global[
-    df_filtrado_global['status_documento'].str.lower() == 'aberto'
-]['valor_saldo'].sum()
-
-# Percentual de vencido sobre o total em aberto
-percentual_vencido = (valor_total_vencido / valor_total_em_aberto * 100) if valor_total_em_aberto > 0 else 0
-
-# Mostra as métricas em colunas
-col1_venc, col2_venc, col3_venc = st.columns(3)
-
-with col1_venc:
-    st.metric("💰 Valor Total Vencido (Em Aberto)", formatar_moeda(valor_total_vencido))
-
-with col2_venc:
-    st.metric("📄 Qtde de Títulos Vencidos", quantidade_titulos_vencidos)
-
-with col3_venc:
-    st.metric("📊 % de Vencidos sobre Aberto", f"{percentual_vencido:.2f} %")
-
-st.markdown("---")
-
-st.subheader("📋 Detalhamento dos Títulos Vencidos em Aberto")
-
-if not df_vencidas_em_aberto.empty:
-    df_vencidas_display = df_vencidas_em_aberto[[
-        'fornecedor', 'numero_documento', 'data_emissao', 'data_vencimento',
-        'valor_documento', 'valor_saldo', 'descricao_tipo_documento'
-    ]].rename(columns={
-        'fornecedor': 'Fornecedor',
-        'numero_documento': 'Número Documento',
-        'data_emissao': 'Data Emissão',
-        'data_vencimento': 'Data Vencimento',
-        'valor_documento': 'Valor Documento',
-        'valor_saldo': 'Valor em Aberto',
-        'descricao_tipo_documento': 'Tipo Documento'
-    })
-
-    # Aplica o destaque e formatação
-    st.dataframe(
-        df_vencidas_display.style
-        .apply(highlight_overdue, axis=1)
-        .format({
-            "Valor Documento": formatar_moeda,
-            "Valor em Aberto": formatar_moeda,
-            "Data Emissão": format_date_br,
-            "Data Vencimento": format_date_br
-        })
-    )
-else:
-    st.info("✅ Não há títulos vencidos em aberto para os filtros selecionados.")
-
-# ---
-st.markdown("---")
-## 📊 Comparativo Pagamentos x Projeções (Mensal)
-
-st.subheader("📊 Comparativo Pagamentos x Projeções (Mensal)")
-
-# Definir intervalo de análise (ano atual)
-ano_analise = datetime.today().year
-
-# Filtrar dados para o ano de análise (considerando vencimento ou quitação no ano)
-df_ano = df_filtrado_global[
-    (df_filtrado_global['data_vencimento'].dt.year == ano_analise) |
-    (df_filtrado_global['data_quitacao'].dt.year == ano_analise)
-]
-
-# Dados previstos: contas em aberto agrupadas por mês de vencimento
-df_previsto = df_ano[df_ano['status_documento'].str.lower() == 'aberto'].copy()
-df_previsto = df_previsto.groupby(df_previsto['MES_ANO_VENCIMENTO'])['valor_saldo'].sum().reset_index()
-df_previsto.rename(columns={'MES_ANO_VENCIMENTO': 'Período', 'valor_saldo': 'Previsto'}, inplace=True)
-df_previsto['Período'] = df_previsto['Período'].astype(str)
-# Adiciona coluna formatada para o hover_data
-df_previsto['Previsto_formatado'] = df_previsto['Previsto'].apply(formatar_moeda)
-
-
-# Dados realizados: contas quitadas agrupadas por mês de quitação
-df_realizado = df_ano[df_ano['status_documento'].str.lower() == 'quitado'].copy()
-df_realizado = df_realizado.groupby(df_realizado['MES_ANO_QUITACAO'])[['valor_documento', 'valor_desconto']].sum().reset_index()
-df_realizado['Realizado'] = df_realizado['valor_documento'] - df_realizado['valor_desconto']
-df_realizado = df_realizado[['MES_ANO_QUITACAO', 'Realizado']]
-df_realizado.rename(columns={'MES_ANO_QUITACAO': 'Período'}, inplace=True)
-df_realizado['Período'] = df_realizado['Período'].astype(str)
-# Adiciona coluna formatada para o hover_data
-df_realizado['Realizado_formatado'] = df_realizado['Realizado'].apply(formatar_moeda)
-
-# Merge dos dois dataframes pelo período (outer join para manter todos os meses)
-df_comparativo = pd.merge(df_previsto, df_realizado, on='Período', how='outer').fillna(0)
-df_comparativo = df_comparativo.sort_values(by='Período')
-
-# Garante que as colunas formatadas existam após o merge (caso algum lado não tenha dados para um período)
-# Aplica formatar_moeda novamente para os NaNs preenchidos por fillna(0)
-df_comparativo['Previsto_formatado'] = df_comparativo['Previsto'].apply(formatar_moeda)
-df_comparativo['Realizado_formatado'] = df_comparativo['Realizado'].apply(formatar_moeda)
-
-
-# Criar o DataFrame no formato "long" **incluindo as colunas formatadas** nos id_vars
-df_melted_for_chart = df_comparativo.melt(
-    id_vars=['Período', 'Previsto_formatado', 'Realizado_formatado'], # Essas colunas serão replicadas
-    value_vars=['Previsto', 'Realizado'],
-    var_name='Situação', # Renomeia a coluna 'variable' para 'Situação'
-    value_name='Valor' # Renomeia a coluna 'value' para 'Valor'
-)
-
-# Adiciona uma coluna para o texto formatado das barras
-df_melted_for_chart['Texto_Barra'] = df_melted_for_chart['Valor'].apply(formatar_moeda)
-
-# Plot do gráfico de barras duplas
-fig_comp = px.bar(
-    df_melted_for_chart,
-    x='Período',
-    y='Valor',
-    color='Situação', # Usa 'Situação' para as cores das barras
-    barmode='group',
-    labels={'Valor': 'Valor (R$)', 'Período': 'Mês', 'Situação': 'Situação'},
-    title='Comparativo Mensal: Pagamentos Previsto x Realizado',
-    text='Texto_Barra', # Usa a coluna formatada para o texto da barra
-    hover_data={
-        'Período': True, # Exibir o período no hover
-        'Valor': False, # Não exibir o valor bruto no hover, usaremos os formatados
-        'Situação': True, # Exibir a situação no hover
-        'Previsto_formatado': True, # Exibir o previsto formatado
-        'Realizado_formatado': True # Exibir o realizado formatado
-    }
-)
-
-fig_comp.update_layout(
-    yaxis=dict(tickprefix="R$ "), # Prefixo de moeda no eixo Y
-    uniformtext_minsize=8,
-    uniformtext_mode='show'
-)
-
-fig_comp.update_traces(textposition='outside') # Ajusta a posição do texto nas barras
-st.plotly_chart(fig_comp, use_container_width=True)
-
-# ---
-st.markdown("---")
-## 📅 Distribuição de Contas a Pagar por Prazo de Vencimento
-
-st.subheader("📅 Distribuição de Contas a Pagar por Prazo de Vencimento")
-
-hoje = pd.to_datetime('today').normalize()
-
-# Filtrar apenas contas em aberto e com data de vencimento válida no futuro (ou hoje)
-df_aberto_prazo = df_filtrado_global[
-    (df_filtrado_global['status_documento'].str.lower() == 'aberto') &
-    (df_filtrado_global['data_vencimento'].notna())
-].copy()
-
-# Calcula os dias restantes para o vencimento
-df_aberto_prazo['dias_para_vencimento'] = (df_aberto_prazo['data_vencimento'] - hoje).dt.days
-
-# Categoriza nas faixas de vencimento
-def categorizar_prazo(dias):
-    if dias <= 0: # Contas já vencidas ou vencendo hoje
-        return 'Vencidas/Hoje'
-    elif dias <= 7:
-        return 'Até 7 dias'
-    elif 8 <= dias <= 15:
-        return '8 a 15 dias'
-    elif 16 <= dias <= 30:
-        return '16 a 30 dias'
-    else: # dias > 30
-        return 'Mais de 30 dias'
-
-df_aberto_prazo['faixa_vencimento'] = df_aberto_prazo['dias_para_vencimento'].apply(categorizar_prazo)
-
-# Agrupa valores por faixa de vencimento
-df_prazo = df_aberto_prazo.groupby('faixa_vencimento')['valor_saldo'].sum().reset_index()
-
-# Ordenar faixas para exibição correta no gráfico (incluindo "Vencidas/Hoje")
-ordem_faixas = ['Vencidas/Hoje', 'Até 7 dias', '8 a 15 dias', '16 a 30 dias', 'Mais de 30 dias']
-df_prazo['faixa_vencimento'] = pd.Categorical(df_prazo['faixa_vencimento'], categories=ordem_faixas, ordered=True)
-df_prazo = df_prazo.sort_values('faixa_vencimento')
-
-# Formatando valores para exibição no gráfico
-df_prazo['valor_formatado'] = df_prazo['valor_saldo'].apply(formatar_moeda)
-
-# Seletor para escolher tipo de gráfico (Barras ou Pizza)
-tipo_grafico = st.radio("Tipo de gráfico:", options=['Barras', 'Pizza'], index=0)
-
-if not df_prazo.empty:
-    if tipo_grafico == 'Barras':
-        fig_prazo = px.bar(
-            df_prazo,
-            x='faixa_vencimento',
-            y='valor_saldo',
-            text='valor_formatado', # Usa a coluna formatada para o texto da barra
-            title='Distribuição de Contas a Pagar por Prazo de Vencimento',
-            labels={'faixa_vencimento': 'Faixa de Vencimento', 'valor_saldo': 'Valor em Aberto (R$)'}
-        )
-        fig_prazo.update_traces(textposition='outside')
-        fig_prazo.update_layout(yaxis=dict(tickprefix="R$ "), uniformtext_minsize=8, uniformtext_mode='show')
-        st.plotly_chart(fig_prazo, use_container_width=True)
-
-    else:  # Gráfico de Pizza
-        fig_prazo = px.pie(
-            df_prazo,
-            names='faixa_vencimento',
-            values='valor_saldo',
-            title='Distribuição de Contas a Pagar por Prazo de Vencimento',
-            hole=0.3, # Cria um gráfico de rosca
-            custom_data=['valor_formatado'] # Passa a coluna formatada para o tooltip
-        )
-        fig_prazo.update_traces(
-            textinfo='percent+label', # Exibe porcentagem e label no gráfico
-            # Ajusta o hovertemplate para usar a coluna formatada do custom_data
-            hovertemplate='<b>%{label}</b><br>Valor: %{customdata[0]}<extra></extra>'
-        )
-        st.plotly_chart(fig_prazo, use_container_width=True)
-else:
-    st.info("Não há contas em aberto para análise de prazo de vencimento com os filtros aplicados.")
\ No newline at end of file
+import pandas as pd
+import numpy as np
+import streamlit as st
+import plotly.express as px
+import os
+
+st.set_page_config(layout="wide", page_title="Análise de Contas a Pagar")
+
+# Data de referência calculada uma única vez por execução do script,
+# em vez de reconstruir "hoje" em cada seção ou função de destaque.
+HOJE = pd.Timestamp.today().normalize()
+# Mesmo instante em resolução de dia, para as comparações numpy vetorizadas
+HOJE64 = np.datetime64(HOJE, 'D')
+
+def formatar_moeda(valor, simbolo_moeda="R$"):
+    """
+    Formata um valor numérico para o formato de moeda brasileiro (R$ X.XXX,XX).
+    Retorna uma string vazia se o valor for NaN ou 'Valor inválido' em caso de erro.
+    """
+    if pd.isna(valor):
+        return ''
+    try:
+        # Garante que o valor é numérico antes de formatar
+        valor = float(valor)
+        return f"{simbolo_moeda} {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    except (TypeError, ValueError):
+        return "Valor inválido"
+
+def formatar_moeda_series(valores, simbolo_moeda="R$"):
+    """
+    Versão vetorizada de formatar_moeda para Series numéricas de gráficos:
+    formata a coluna inteira e faz as trocas de separador com operações de
+    string em C, em vez de uma chamada Python por célula.
+    NaN vira string vazia, como na versão escalar.
+    """
+    validos = valores.dropna()
+    out = validos.map('{:,.2f}'.format).astype('string')
+    out = (out.str.replace(',', 'X', regex=False)
+              .str.replace('.', ',', regex=False)
+              .str.replace('X', '.', regex=False))
+    return (simbolo_moeda + ' ' + out).reindex(valores.index, fill_value='')
+
+def format_date_br(data):
+    """
+    Formata uma data para o padrão brasileiro (DD/MM/AAAA).
+    Retorna uma string vazia se a data for NaN.
+    """
+    if pd.isna(data):
+        return ''
+    return data.strftime('%d/%m/%Y')
+
+def highlight_overdue(df_display):
+    """
+    Função para destacar linhas de contas vencidas em um DataFrame.
+    Recebe o DataFrame inteiro (uso com Styler.apply e axis=None) e retorna a
+    matriz de estilos CSS calculada de forma vetorizada, sem laço por linha.
+    """
+    if 'Data Vencimento' not in df_display.columns:
+        return pd.DataFrame('', index=df_display.index, columns=df_display.columns) # Sem destaque
+
+    # Comparação numpy em resolução de dia; NaT nunca recebe destaque
+    mask = df_display['Data Vencimento'].to_numpy().astype('datetime64[D]') < HOJE64
+    styles = np.where(mask[:, None], 'background-color: #f8230f', '') # Vermelho
+    return pd.DataFrame(
+        np.broadcast_to(styles, df_display.shape),
+        index=df_display.index, columns=df_display.columns
+    )
+
+INPUT_CSV_FILE = 'contas_pagar.csv'
+INPUT_PARQUET_FILE = 'contas_pagar.parquet'
+
+# Únicas colunas que o aplicativo realmente utiliza; a leitura do Parquet
+# projeta apenas essas colunas, evitando carregar o restante do arquivo.
+COLUNAS_UTILIZADAS = [
+    'status_documento', 'numero_documento', 'data_emissao', 'data_vencimento',
+    'data_quitacao', 'valor_documento', 'valor_desconto', 'valor_saldo',
+    'fornecedor', 'descricao_tipo_documento'
+]
+
+def csv_to_parquet():
+    """
+    Conversão única (offline) do CSV de origem para Parquet tipado.
+    Lê o CSV interpretando datas e decimais e grava contas_pagar.parquet
+    com pyarrow + snappy; load_data passa a preferir esse arquivo.
+    """
+    df_csv = pd.read_csv(
+        INPUT_CSV_FILE,
+        parse_dates=['data_emissao', 'data_vencimento', 'data_quitacao'],
+        date_format='%Y-%m-%d'
+    )
+    for col in ['valor_documento', 'valor_desconto', 'valor_saldo']:
+        df_csv[col] = pd.to_numeric(
+            df_csv[col].astype(str).str.replace(',', '.', regex=False), errors='coerce'
+        ).fillna(0)
+    df_csv.to_parquet(INPUT_PARQUET_FILE, engine='pyarrow', compression='snappy')
+
+@st.cache_data(persist="disk", show_spinner=False)
+def load_data():
+    """
+    Carrega e pré-processa os dados de contas a pagar.
+    Prefere o arquivo Parquet (colunas já tipadas, leitura apenas das colunas
+    usadas); na ausência dele, lê o CSV e faz as conversões de tipo.
+    Utiliza st.cache_data para otimizar o carregamento.
+    """
+    if os.path.exists(INPUT_PARQUET_FILE):
+        # Parquet já armazena datas como datetime64 e valores como float64,
+        # dispensando todo o parse de datas e de separador decimal.
+        df = pd.read_parquet(INPUT_PARQUET_FILE, engine='pyarrow', columns=COLUNAS_UTILIZADAS)
+    elif os.path.exists(INPUT_CSV_FILE):
+        df = pd.read_csv(INPUT_CSV_FILE)
+
+        # Conversão de colunas de data: formato explícito cai no caminho rápido
+        # em C (sem inferência) e cache=True deduplica datas repetidas entre parcelas
+        df['data_emissao'] = pd.to_datetime(df['data_emissao'], format='%Y-%m-%d', errors='coerce', cache=True)
+        df['data_vencimento'] = pd.to_datetime(df['data_vencimento'], format='%Y-%m-%d', errors='coerce', cache=True)
+        df['data_quitacao'] = pd.to_datetime(df['data_quitacao'], format='%Y-%m-%d', errors='coerce', cache=True)
+
+        # Conversão de colunas numéricas: quando o CSV usa ponto decimal o
+        # read_csv já entrega float64 e nada é feito; a troca de vírgula por
+        # ponto só roda se a coluna vier como texto (export com vírgula decimal)
+        for col in ['valor_documento', 'valor_desconto', 'valor_saldo']:
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col].astype('string').str.replace(',', '.', regex=False), errors='coerce')
+            df[col] = df[col].fillna(0)
+
+        # Colunas de texto com backing pyarrow: .str.*, comparações e .isin
+        # rodam em kernels C++ do Arrow, com memória bem menor que object.
+        # No pandas >= 3 o read_csv já infere strings assim; o cast explícito
+        # cobre versões 2.x, onde o fallback de CSV entregava object.
+        for col in ['fornecedor', 'numero_documento', 'status_documento', 'descricao_tipo_documento']:
+            df[col] = df[col].astype('string[pyarrow]')
+    else:
+        st.error(f"Erro: Nenhum arquivo de dados encontrado. Por favor, coloque '{INPUT_PARQUET_FILE}' ou '{INPUT_CSV_FILE}' na mesma pasta do aplicativo.")
+        st.stop()
+
+    # Moeda em float32: metade da banda de memória em somas, máscaras e
+    # agrupamentos, com os ~8 dígitos significativos que valores em BRL pedem.
+    # As somas que produzem totais acumulam em float64 (ver sites de .sum).
+    for col in ['valor_documento', 'valor_desconto', 'valor_saldo']:
+        df[col] = df[col].astype('float32')
+
+    # Preenchimento de valores ausentes em colunas de texto
+    df['fornecedor'] = df['fornecedor'].fillna('Fornecedor Não Informado')
+    df['descricao_tipo_documento'] = df['descricao_tipo_documento'].fillna('Não Informado')
+
+    # Colunas de texto de baixa cardinalidade viram category: .isin e comparações
+    # passam a operar sobre códigos inteiros e o consumo de memória cai bastante.
+    df['fornecedor'] = df['fornecedor'].astype('category')
+    df['descricao_tipo_documento'] = df['descricao_tipo_documento'].astype('category')
+
+    # Normaliza o status uma única vez na carga: evita um .str.lower() por consulta
+    # e a comparação com category vira comparação de códigos inteiros.
+    df['status_documento'] = df['status_documento'].str.lower().astype('category')
+
+    # Mantém o DataFrame ordenado por vencimento: recortes por intervalo de data
+    # viram busca binária (fatiar_por_vencimento) em vez de varredura booleana.
+    df = df.sort_values('data_vencimento', na_position='last', ignore_index=True)
+
+    # Criação de colunas auxiliares para análise de período
+    # Split vetorizado em C no lugar do lambda por linha; category porque a
+    # coluna serve de chave de agrupamento (base da nota, sem a parcela).
+    df['numero_documento_base'] = (
+        df['numero_documento'].astype('string').str.split('/', n=1).str[0].astype('category')
+    )
+    df['MES_ANO_VENCIMENTO'] = df['data_vencimento'].dt.to_period('M')
+    df['MES_ANO_QUITACAO'] = df['data_quitacao'].dt.to_period('M')
+
+    # Chave inteira ano*12+mês por data: o filtro mensal vira uma única
+    # comparação escalar x array Int32, sem extrair .dt.year/.dt.month por consulta.
+    df['vcto_ym'] = (df['data_vencimento'].dt.year * 12 + df['data_vencimento'].dt.month).astype('Int32')
+    df['quit_ym'] = (df['data_quitacao'].dt.year * 12 + df['data_quitacao'].dt.month).astype('Int32')
+
+    # Ano pré-extraído em Int16: as máscaras por ano comparam contra esta
+    # coluna pequena em vez de refazer .dt.year (que aloca um array novo)
+    # a cada consulta.
+    df['year_venc'] = df['data_vencimento'].dt.year.astype('Int16')
+    df['year_quit'] = df['data_quitacao'].dt.year.astype('Int16')
+    return df
+
+# Carrega os dados
+df = load_data()
+
+def fatiar_por_vencimento(df_ordenado, inicio=None, fim=None):
+    """
+    Recorta o intervalo [inicio, fim) de data_vencimento por busca binária.
+    Pressupõe ordenação por data_vencimento (garantida em load_data e
+    preservada pelos filtros booleanos); NaT fica ao final e só entra no
+    recorte quando não há limite superior.
+    """
+    datas = df_ordenado['data_vencimento'].to_numpy()
+    inicio_i = 0 if inicio is None else datas.searchsorted(np.datetime64(inicio), side='left')
+    fim_i = len(datas) if fim is None else datas.searchsorted(np.datetime64(fim), side='left')
+    return df_ordenado.iloc[inicio_i:fim_i]
+
+@st.cache_data(show_spinner=False)
+def get_metricas_visao_geral(df_filtered):
+    """
+    Calcula em uma única passada os dois totais da visão geral: valor total
+    de contas e valor total em aberto. Somas numpy com acumulador float64
+    para não perder precisão ao somar float32.
+    """
+    valor_total = df_filtered['valor_documento'].to_numpy().sum(dtype='float64')
+    mascara_aberto = (df_filtered['status_documento'] == 'aberto').to_numpy()
+    valor_aberto = df_filtered['valor_saldo'].to_numpy()[mascara_aberto].sum(dtype='float64')
+    return valor_total, valor_aberto
+
+def mascara_filtro_categoria(serie_categorica, selecionados):
+    """
+    Máscara booleana de um filtro sobre coluna category, ou None quando a
+    seleção não restringe nada ('Todos' ou vazia). Opera sobre os códigos
+    inteiros das categorias, sem .isin sobre os valores.
+    """
+    if not selecionados or 'Todos' in selecionados:
+        return None
+    codigos = serie_categorica.cat.categories.get_indexer(list(selecionados))
+    # Códigos -1 (seleções inexistentes e NaN) nunca casam
+    return np.isin(serie_categorica.cat.codes.to_numpy(), codigos[codigos >= 0])
+
+@st.cache_data(show_spinner=False)
+def get_status_opcoes(_df):
+    """Opções do filtro de status; lê a tabela de categorias, sem varrer a coluna."""
+    return ['Todos'] + sorted(_df['status_documento'].cat.categories.tolist())
+
+@st.cache_data(show_spinner=False)
+def get_tipo_opcoes(_df):
+    """Opções do filtro de tipo de documento, a partir das categorias."""
+    return ['Todos'] + sorted(_df['descricao_tipo_documento'].cat.categories.tolist())
+
+@st.cache_data(show_spinner=False)
+def get_meses_opcoes(_df, ano):
+    """
+    Opções de mês do ano corrente para o filtro global. A máscara de ano
+    usa a coluna year_venc pré-extraída e o resultado fica cacheado por ano.
+    """
+    periodos = _df.loc[_df['year_venc'].eq(ano).fillna(False).to_numpy(), 'MES_ANO_VENCIMENTO'].unique()
+    return ['Todos os Meses'] + sorted(str(p) for p in periodos)
+
+@st.cache_data(show_spinner=False)
+def aplicar_filtros_globais(_df, mes_selecionado, status_selecionados, tipo_selecionados):
+    """
+    Aplica os filtros globais (mês, status, tipo) e devolve o DataFrame filtrado.
+    As seleções (valores primitivos) servem de chave de cache: reruns em que os
+    filtros não mudaram reutilizam o resultado. `_df` não entra na chave,
+    pois já vem do cache de load_data.
+    """
+    # Máscara única combinando mês, status e tipo: uma só indexação booleana,
+    # sem DataFrame intermediário por etapa de filtro
+    mask = np.ones(len(_df), dtype=bool)
+
+    if mes_selecionado != 'Todos os Meses':
+        period_selected = pd.Period(mes_selecionado, 'M')
+        ym_selecionado = period_selected.year * 12 + period_selected.month
+        # Filtra por mês de vencimento OU mês de quitação, para abranger ambos os cenários
+        mask &= (_df['vcto_ym'].eq(ym_selecionado) |
+                 _df['quit_ym'].eq(ym_selecionado)).fillna(False).to_numpy()
+
+    mascara_status = mascara_filtro_categoria(_df['status_documento'], status_selecionados)
+    if mascara_status is not None:
+        mask &= mascara_status
+    mascara_tipo = mascara_filtro_categoria(_df['descricao_tipo_documento'], tipo_selecionados)
+    if mascara_tipo is not None:
+        mask &= mascara_tipo
+
+    df_filtrado = _df if mask.all() else _df[mask]
+
+    # Projeta apenas as colunas que as seções consomem, descartando as chaves
+    # auxiliares (vcto_ym/quit_ym, numero_documento_base) usadas só até aqui;
+    # year_venc/year_quit seguem adiante para as máscaras de ano do comparativo
+    return df_filtrado[COLUNAS_UTILIZADAS + ['MES_ANO_VENCIMENTO', 'MES_ANO_QUITACAO', 'year_venc', 'year_quit']]
+
+@st.cache_data(show_spinner=False)
+def get_comparativo_mensal(_df_aberto, _df_quitado, ano_analise, chave_filtros):
+    """
+    Monta a série mensal Previsto x Realizado já no formato "long" do gráfico.
+    As fatias por status não entram na chave de cache (derivam do resultado
+    cacheado de aplicar_filtros_globais); `chave_filtros` identifica a seleção
+    vigente, de modo que reruns sem mudança de filtro reutilizam o resultado.
+    """
+    # Dados previstos: contas em aberto agrupadas por mês de vencimento.
+    # Restrição de ano considerando vencimento ou quitação no ano de análise,
+    # sobre as colunas year_venc/year_quit pré-extraídas na carga.
+    df_aberto_ano = _df_aberto[
+        (_df_aberto['year_venc'].eq(ano_analise) |
+         _df_aberto['year_quit'].eq(ano_analise)).fillna(False).to_numpy()
+    ]
+    serie_previsto = df_aberto_ano.groupby(df_aberto_ano['MES_ANO_VENCIMENTO'], sort=False)['valor_saldo'].sum()
+
+    # Dados realizados: contas quitadas agrupadas por mês de quitação
+    df_quitado_ano = _df_quitado[
+        (_df_quitado['year_venc'].eq(ano_analise) |
+         _df_quitado['year_quit'].eq(ano_analise)).fillna(False).to_numpy()
+    ]
+    soma_quitado = df_quitado_ano.groupby(df_quitado_ano['MES_ANO_QUITACAO'], sort=False)[['valor_documento', 'valor_desconto']].sum()
+    serie_realizado = soma_quitado['valor_documento'] - soma_quitado['valor_desconto']
+
+    # Combina as duas séries por alinhamento de índice (outer), mantendo todos
+    # os meses — substitui o merge e seus DataFrames intermediários
+    df_comparativo = (
+        pd.concat({'Previsto': serie_previsto, 'Realizado': serie_realizado}, axis=1)
+        .fillna(0)
+        .sort_index()
+    )
+    df_comparativo.index = df_comparativo.index.astype(str)
+    df_comparativo = df_comparativo.rename_axis('Período').reset_index()
+
+    # Criar o DataFrame no formato "long" para o gráfico de barras agrupadas
+    df_melted_for_chart = df_comparativo.melt(
+        id_vars=['Período'],
+        value_vars=['Previsto', 'Realizado'],
+        var_name='Situação', # Renomeia a coluna 'variable' para 'Situação'
+        value_name='Valor' # Renomeia a coluna 'value' para 'Valor'
+    )
+
+    # Única passada de formatação, depois do melt: serve tanto para o texto
+    # das barras quanto para o hover
+    df_melted_for_chart['Texto_Barra'] = formatar_moeda_series(df_melted_for_chart['Valor'])
+    return df_melted_for_chart
+
+@st.cache_data(show_spinner=False)
+def get_distribuicao_prazo(_df_aberto, hoje, chave_filtros):
+    """
+    Distribui o saldo em aberto pelas faixas de prazo de vencimento.
+    `hoje` entra na chave de cache para o resultado expirar na virada do dia;
+    `chave_filtros` identifica a seleção vigente, como no comparativo.
+    """
+    # Reaproveita a fatia de contas abertas, mantendo só vencimentos válidos.
+    # Sem .copy(): o groupby só lê, e as séries derivadas ficam em variáveis
+    # locais em vez de virar colunas na fatia.
+    df_aberto_prazo = _df_aberto[_df_aberto['data_vencimento'].notna()]
+
+    # Calcula os dias restantes para o vencimento
+    dias_para_vencimento = (df_aberto_prazo['data_vencimento'] - hoje).dt.days
+
+    # Categoriza nas faixas de vencimento com um único pd.cut (bucketização em C,
+    # já devolvendo categórica ordenada) em vez de uma função Python por linha
+    ordem_faixas = ['Vencidas/Hoje', 'Até 7 dias', '8 a 15 dias', '16 a 30 dias', 'Mais de 30 dias']
+    faixa_vencimento = pd.cut(
+        dias_para_vencimento,
+        bins=[-np.inf, 0, 7, 15, 30, np.inf],
+        labels=ordem_faixas,
+        right=True
+    ).rename('faixa_vencimento')
+
+    # Agrupa valores por faixa de vencimento, usando a série como chave.
+    # observed=True explícito: não materializa faixas sem lançamentos
+    # (é o default no pandas >= 3, mas aqui fica independente da versão).
+    # A chave já é categórica ordenada (saída do pd.cut com labels em
+    # ordem_faixas), então o groupby ordenado devolve as faixas na ordem de
+    # exibição do gráfico — sem re-wrap em pd.Categorical nem sort_values.
+    df_prazo = df_aberto_prazo.groupby(faixa_vencimento, observed=True)['valor_saldo'].sum().reset_index()
+
+    # Formatando valores para exibição no gráfico
+    df_prazo['valor_formatado'] = formatar_moeda_series(df_prazo['valor_saldo'])
+    return df_prazo
+
+st.title("📊 Análise de Contas a Pagar")
+
+# ---
+st.markdown("---")
+## 🔍 Filtros Globais
+
+
+with st.expander("🔍 Filtros Globais", expanded=True):
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        # Pega só os períodos do ano atual para o filtro de mês (cacheado)
+        meses_opcoes_global = get_meses_opcoes(df, HOJE.year)
+
+        # Define 'Todos os Meses' como padrão (índice 0)
+        mes_selecionado_global = st.selectbox("Selecione o Mês de Análise:", options=meses_opcoes_global, index=0)
+
+    with col2:
+        status_opcoes = get_status_opcoes(df)
+        # Define 'Todos' como padrão para status
+        status_selecionados = st.multiselect("Filtrar Status do Documento:", options=status_opcoes, default=['Todos'])
+
+    with col3:
+        tipo_opcoes = get_tipo_opcoes(df)
+        # Define 'Todos' como padrão para tipo de documento
+        tipo_selecionados = st.multiselect("Filtrar Tipo de Documento:", options=tipo_opcoes, default=['Todos'])
+
+# Chave da seleção vigente, compartilhada pelos caches por filtro abaixo
+chave_filtros_global = (mes_selecionado_global, tuple(status_selecionados), tuple(tipo_selecionados))
+
+# Aplicação dos filtros no DataFrame global (resultado cacheado por seleção)
+df_filtrado_global = aplicar_filtros_globais(df, *chave_filtros_global)
+
+# Particiona o resultado por status uma única vez; as seções abaixo reutilizam
+# as fatias em vez de reconstruir a mesma máscara booleana várias vezes.
+df_aberto_global = df_filtrado_global[df_filtrado_global['status_documento'] == 'aberto']
+df_quitado_global = df_filtrado_global[df_filtrado_global['status_documento'] == 'quitado']
+
+# ---
+st.markdown("---")
+## Visão Geral do Período Selecionado
+
+st.subheader("Visão Geral do Período Selecionado")
+titulo_visao_geral = "Todos os Meses" if mes_selecionado_global == 'Todos os Meses' else mes_selecionado_global
+
+col1_metric, col2_metric = st.columns(2)
+valor_total_contas, valor_aberto = get_metricas_visao_geral(df_filtrado_global)
+
+with col1_metric:
+    st.metric(label=f"Valor Total de Contas ({titulo_visao_geral})", value=formatar_moeda(valor_total_contas))
+
+with col2_metric:
+    st.metric(label=f"Valor Total em Aberto ({titulo_visao_geral})", value=formatar_moeda(valor_aberto))
+
+# ---
+st.markdown("---")
+## Contas em Aberto (Respeitando Período e Filtros)
+
+
+st.subheader("Contas em Aberto (Respeitando Período e Filtros)")
+
+df_em_aberto = df_aberto_global
+
+if not df_em_aberto.empty:
+    df_display_aberto = df_em_aberto[['fornecedor', 'numero_documento', 'data_vencimento', 'valor_saldo', 'descricao_tipo_documento']].rename(columns={
+        'fornecedor': 'Fornecedor',
+        'numero_documento': 'Número Documento',
+        'data_vencimento': 'Data Vencimento',
+        'valor_saldo': 'Valor a Pagar',
+        'descricao_tipo_documento': 'Tipo Documento'
+    })
+    # Aplica o destaque para vencidos e formatação de moeda/data
+    st.dataframe(df_display_aberto.style.apply(highlight_overdue, axis=None).format({
+        "Valor a Pagar": formatar_moeda,
+        "Data Vencimento": format_date_br
+    }))
+else:
+    st.info("Não há contas em aberto para o período e filtros selecionados.")
+
+# ---
+st.markdown("---")
+## 📅 Contas a Pagar por Período
+
+st.subheader("📅 Contas a Pagar por Período")
+
+ano_atual = HOJE.year
+
+if mes_selecionado_global == 'Todos os Meses':
+    # Filtra apenas vencimentos do ano atual para o gráfico mensal
+    df_ano_atual = fatiar_por_vencimento(
+        df_filtrado_global,
+        inicio=pd.Timestamp(ano_atual, 1, 1),
+        fim=pd.Timestamp(ano_atual + 1, 1, 1)
+    )
+
+    # Agrupa direto na coluna datetime64 (chave int64) em vez de materializar
+    # a comparação sobre o PeriodArray; bins vazios do Grouper são descartados
+    # para manter só os meses com lançamentos, como antes.
+    agrupado_mes = df_ano_atual.groupby(pd.Grouper(key='data_vencimento', freq='MS'))['valor_documento'].agg(['sum', 'size'])
+    agrupado_mes = agrupado_mes[agrupado_mes['size'] > 0]
+    valores_periodo = agrupado_mes['sum'].rename('valor_documento').reset_index()
+    valores_periodo['MES_ANO_VENCIMENTO'] = valores_periodo['data_vencimento'].dt.strftime('%Y-%m')
+    valores_periodo['valor_documento_formatado'] = formatar_moeda_series(valores_periodo['valor_documento'])
+    title_graph = f"📅 Contas a Pagar por Mês de Vencimento ({ano_atual})"
+    x_axis = 'MES_ANO_VENCIMENTO'
+else:
+    # Filtra por dia se um mês específico for selecionado. dt.floor('D')
+    # mantém o dtype datetime64 (dt.date criaria objetos Python por linha).
+    valores_periodo = df_filtrado_global.groupby(df_filtrado_global['data_vencimento'].dt.floor('D'))['valor_documento'].sum().reset_index()
+    valores_periodo['valor_documento_formatado'] = formatar_moeda_series(valores_periodo['valor_documento'])
+    title_graph = "📅 Contas a Pagar por Dia de Vencimento"
+    x_axis = 'data_vencimento'
+
+if not valores_periodo.empty:
+    fig_venc = px.bar(
+        valores_periodo,
+        x=x_axis,
+        y='valor_documento',
+        title=title_graph,
+        text='valor_documento_formatado', # Usa a coluna formatada para o texto da barra
+        height=600
+    )
+
+    fig_venc.update_traces(
+        texttemplate='%{text}',
+        textposition='outside',
+        textfont=dict(size=14)
+    )
+
+    fig_venc.update_layout(
+        uniformtext_minsize=8,
+        uniformtext_mode='show',
+        yaxis=dict(tickprefix="R$ "), # Prefixo de moeda no eixo Y
+        xaxis_title='Período',
+        yaxis_title='Valor Total (R$)'
+    )
+
+    st.plotly_chart(fig_venc, use_container_width=True)
+else:
+    st.info("Não há dados para exibir no gráfico de contas a pagar para os filtros selecionados.")
+
+# ---
+st.markdown("---")
+## 📌 Contas Vencidas em Aberto (Atrasadas)
+
+st.subheader("📌 Contas Vencidas em Aberto (Atrasadas)")
+
+# Filtra documentos em aberto e que a data de vencimento é anterior a hoje
+# (recorte por busca binária sobre a fatia de contas abertas, já ordenada)
+df_vencidas_em_aberto = fatiar_por_vencimento(df_aberto_global, fim=HOJE)
+
+valor_total_vencido = df_vencidas_em_aberto['valor_saldo'].to_numpy().sum(dtype='float64')
+quantidade_titulos_vencidos = df_vencidas_em_aberto.shape[0]
+
+# Calcula o valor total em aberto para o percentual
+valor_total_em_aberto = df_aberto_global['valor_saldo'].to_numpy().sum(dtype='float64')
+
+# Percentual de vencido sobre o total em aberto
+percentual_vencido = (valor_total_vencido / valor_total_em_aberto * 100) if valor_total_em_aberto > 0 else 0
+
+# Mostra as métricas em colunas
+col1_venc, col2_venc, col3_venc = st.columns(3)
+
+with col1_venc:
+    st.metric("💰 Valor Total Vencido (Em Aberto)", formatar_moeda(valor_total_vencido))
+
+with col2_venc:
+    st.metric("📄 Qtde de Títulos Vencidos", quantidade_titulos_vencidos)
+
+with col3_venc:
+    st.metric("📊 % de Vencidos sobre Aberto", f"{percentual_vencido:.2f} %")
+
+st.markdown("---")
+
+st.subheader("📋 Detalhamento dos Títulos Vencidos em Aberto")
+
+if not df_vencidas_em_aberto.empty:
+    df_vencidas_display = df_vencidas_em_aberto[[
+        'fornecedor', 'numero_documento', 'data_emissao', 'data_vencimento',
+        'valor_documento', 'valor_saldo', 'descricao_tipo_documento'
+    ]].rename(columns={
+        'fornecedor': 'Fornecedor',
+        'numero_documento': 'Número Documento',
+        'data_emissao': 'Data Emissão',
+        'data_vencimento': 'Data Vencimento',
+        'valor_documento': 'Valor Documento',
+        'valor_saldo': 'Valor em Aberto',
+        'descricao_tipo_documento': 'Tipo Documento'
+    })
+
+    # Aplica o destaque e formatação
+    st.dataframe(
+        df_vencidas_display.style
+        .apply(highlight_overdue, axis=None)
+        .format({
+            "Valor Documento": formatar_moeda,
+            "Valor em Aberto": formatar_moeda,
+            "Data Emissão": format_date_br,
+            "Data Vencimento": format_date_br
+        })
+    )
+else:
+    st.info("✅ Não há títulos vencidos em aberto para os filtros selecionados.")
+
+# ---
+st.markdown("---")
+## 📊 Comparativo Pagamentos x Projeções (Mensal)
+
+st.subheader("📊 Comparativo Pagamentos x Projeções (Mensal)")
+
+# Seção como fragmento: o checkbox re-executa apenas esta função, sem rerun
+# do script inteiro (carga, filtros e demais gráficos ficam intactos).
+# Os argumentos são os valores do último rerun completo, que é o desejado.
+@st.fragment
+def render_comparativo_mensal(df_aberto, df_quitado, chave_filtros):
+    # Cálculo adiado: os agrupamentos só executam quando o usuário abre a análise
+    if not st.checkbox("Mostrar comparativo mensal", value=False):
+        return
+    # Pipeline cacheado por seleção de filtros: reruns disparados por widgets
+    # de outras seções reutilizam o resultado sem refazer os agrupamentos
+    df_melted_for_chart = get_comparativo_mensal(
+        df_aberto, df_quitado, HOJE.year, chave_filtros
+    )
+
+    # Plot do gráfico de barras duplas
+    fig_comp = px.bar(
+        df_melted_for_chart,
+        x='Período',
+        y='Valor',
+        color='Situação', # Usa 'Situação' para as cores das barras
+        barmode='group',
+        labels={'Valor': 'Valor (R$)', 'Período': 'Mês', 'Situação': 'Situação'},
+        title='Comparativo Mensal: Pagamentos Previsto x Realizado',
+        text='Texto_Barra', # Usa a coluna formatada para o texto da barra
+        hover_data={
+            'Período': True, # Exibir o período no hover
+            'Valor': False, # Não exibir o valor bruto no hover, usamos o formatado
+            'Situação': True, # Exibir a situação no hover
+            'Texto_Barra': True # Valor formatado em moeda
+        }
+    )
+
+    fig_comp.update_layout(
+        yaxis=dict(tickprefix="R$ "), # Prefixo de moeda no eixo Y
+        uniformtext_minsize=8,
+        uniformtext_mode='show'
+    )
+
+    fig_comp.update_traces(textposition='outside') # Ajusta a posição do texto nas barras
+    st.plotly_chart(fig_comp, use_container_width=True)
+
+render_comparativo_mensal(df_aberto_global, df_quitado_global, chave_filtros_global)
+
+# ---
+st.markdown("---")
+## 📅 Distribuição de Contas a Pagar por Prazo de Vencimento
+
+st.subheader("📅 Distribuição de Contas a Pagar por Prazo de Vencimento")
+
+# Fragmento como no comparativo: alternar o checkbox ou o rádio Barras/Pizza
+# redesenha só esta seção.
+@st.fragment
+def render_distribuicao_prazo(df_aberto, chave_filtros):
+    # Cálculo adiado, como no comparativo mensal.
+    if not st.checkbox("Mostrar distribuição por prazo", value=False):
+        return
+    # Pipeline cacheado por seleção de filtros (e por dia), como no comparativo
+    df_prazo = get_distribuicao_prazo(df_aberto, HOJE, chave_filtros)
+
+    # Seletor para escolher tipo de gráfico (Barras ou Pizza)
+    tipo_grafico = st.radio("Tipo de gráfico:", options=['Barras', 'Pizza'], index=0)
+
+    if not df_prazo.empty:
+        if tipo_grafico == 'Barras':
+            fig_prazo = px.bar(
+                df_prazo,
+                x='faixa_vencimento',
+                y='valor_saldo',
+                text='valor_formatado', # Usa a coluna formatada para o texto da barra
+                title='Distribuição de Contas a Pagar por Prazo de Vencimento',
+                labels={'faixa_vencimento': 'Faixa de Vencimento', 'valor_saldo': 'Valor em Aberto (R$)'}
+            )
+            fig_prazo.update_traces(textposition='outside')
+            fig_prazo.update_layout(yaxis=dict(tickprefix="R$ "), uniformtext_minsize=8, uniformtext_mode='show')
+            st.plotly_chart(fig_prazo, use_container_width=True)
+
+        else:  # Gráfico de Pizza
+            fig_prazo = px.pie(
+                df_prazo,
+                names='faixa_vencimento',
+                values='valor_saldo',
+                title='Distribuição de Contas a Pagar por Prazo de Vencimento',
+                hole=0.3, # Cria um gráfico de rosca
+                custom_data=['valor_formatado'] # Passa a coluna formatada para o tooltip
+            )
+            fig_prazo.update_traces(
+                textinfo='percent+label', # Exibe porcentagem e label no gráfico
+                # Ajusta o hovertemplate para usar a coluna formatada do custom_data
+                hovertemplate='<b>%{label}</b><br>Valor: %{customdata[0]}<extra></extra>'
+            )
+            st.plotly_chart(fig_prazo, use_container_width=True)
+    else:
+        st.info("Não há contas em aberto para análise de prazo de vencimento com os filtros aplicados.")
+
+render_distribuicao_prazo(df_aberto_global, chave_filtros_global)
\ No newline at end of file